@@ -0,0 +1,199 @@
+from collections import deque
+import numpy as np
+
+# === CONFIG (mirrors roomIlluminationControlAutomation/src/main.cpp) ===
+STEPS_PER_REVOLUTION = 2048  # Fully closed blind position
+STEPPER_SPEED = 200          # steps/s, myStepper.setSpeed(200)
+THRESHOLD_OUTSIDE = 2500
+THRESHOLD_INSIDE = 2000
+LOOP_PERIOD = 3.0            # s, delay(3000) in loop()
+
+# --- Blind positioning ---
+BLIND_SMOOTHING = 40         # Readings in the running median (2 min at 3 s)
+BLIND_LEVELS = 4             # Partial positions between open and closed
+BLIND_OPEN_BELOW = THRESHOLD_OUTSIDE - 250   # Fully open at/below this
+BLIND_CLOSED_ABOVE = THRESHOLD_OUTSIDE + 750  # Fully closed at/above this
+BLIND_HYSTERESIS = 0.5       # Leaving a level takes 1 level = 250 counts, above the
+                             # ~225-count spread of the raw readings
+BLIND_SETTLE = 6.0           # s a new target must persist before moving
+BLIND_MIN_DWELL = 60.0       # s between two blind moves
+
+# --- Relay ---
+RELAY_SMOOTHING = 40         # Readings in the running median
+RELAY_DEADBAND = 100         # ADC counts around THRESHOLD_INSIDE
+RELAY_SETTLE = 6.0
+RELAY_MIN_DWELL = 30.0
+
+
+# === STEP 1: Coalescing Command Channel ===
+class CoalescingChannel:
+    """Holds at most one pending value per actuator.
+
+    A newer proposal replaces the pending one (the old one is dropped as
+    superseded), and the value is only released once it has been stable for
+    `settle` seconds and `min_dwell` seconds have passed since the last
+    release.
+    """
+
+    def __init__(self, initial, settle, min_dwell):
+        self.current = initial
+        self.settle = settle
+        self.min_dwell = min_dwell
+        self.pending = None
+        self.pending_since = None
+        self.last_release = -np.inf
+        self.superseded = 0
+
+    def propose(self, t, value):
+        if value == self.pending:
+            return
+        if self.pending is not None:
+            self.superseded += 1  # Never executed, replaced by a newer target
+        if value == self.current:
+            self.pending = None
+            self.pending_since = None
+        else:
+            self.pending = value
+            self.pending_since = t
+
+    def poll(self, t):
+        if self.pending is None:
+            return None
+        if t - self.pending_since < self.settle:
+            return None
+        if t - self.last_release < self.min_dwell:
+            return None
+        value = self.pending
+        self.current = value
+        self.pending = None
+        self.pending_since = None
+        self.last_release = t
+        return value
+
+
+# === STEP 2: Actuation Scheduler ===
+class ActuationScheduler:
+    """Turns raw LDR readings into coalesced BLIND/RELAY commands.
+
+    Readings are smoothed with a running median before the deadbands are
+    applied, so the deadbands act on the light level rather than on sensor
+    noise; the dwell times only cap the rate on top of that.
+    """
+
+    def __init__(self, send=print, blind_min_dwell=BLIND_MIN_DWELL,
+                 relay_min_dwell=RELAY_MIN_DWELL):
+        self.send = send
+        self.blind = CoalescingChannel(0, BLIND_SETTLE, blind_min_dwell)
+        self.relay = CoalescingChannel(False, RELAY_SETTLE, relay_min_dwell)
+        self.outside_history = deque(maxlen=BLIND_SMOOTHING)
+        self.inside_history = deque(maxlen=RELAY_SMOOTHING)
+        self.blind_level = 0
+        self.relay_wanted = False
+        self.blind_moves = 0
+        self.relay_toggles = 0
+        self.steps_moved = 0
+        self.blocking_time = 0.0
+
+    def blind_target(self, light_outside):
+        # Continuous level in [0, BLIND_LEVELS]; only leave the current level
+        # once the reading is clearly inside a neighbouring one.
+        span = BLIND_CLOSED_ABOVE - BLIND_OPEN_BELOW
+        frac = np.clip((light_outside - BLIND_OPEN_BELOW) / span, 0.0, 1.0)
+        level_f = frac * BLIND_LEVELS
+        if abs(level_f - self.blind_level) > 0.5 + BLIND_HYSTERESIS:
+            self.blind_level = int(round(level_f))
+        return self.blind_level * STEPS_PER_REVOLUTION // BLIND_LEVELS
+
+    def relay_target(self, light_inside):
+        if light_inside < THRESHOLD_INSIDE - RELAY_DEADBAND:
+            self.relay_wanted = True
+        elif light_inside > THRESHOLD_INSIDE + RELAY_DEADBAND:
+            self.relay_wanted = False
+        return self.relay_wanted
+
+    def update(self, t, light_outside, light_inside):
+        self.outside_history.append(light_outside)
+        self.inside_history.append(light_inside)
+        outside = np.median(self.outside_history)
+        inside = np.median(self.inside_history)
+        self.blind.propose(t, self.blind_target(outside))
+        self.relay.propose(t, self.relay_target(inside))
+
+        commands = []
+        previous = self.blind.current
+        position = self.blind.poll(t)
+        if position is not None:
+            steps = abs(position - previous)
+            self.blind_moves += 1
+            self.steps_moved += steps
+            self.blocking_time += steps / STEPPER_SPEED
+            commands.append(f"BLIND {position}")
+
+        state = self.relay.poll(t)
+        if state is not None:
+            self.relay_toggles += 1
+            commands.append(f"RELAY {int(state)}")
+
+        for command in commands:
+            self.send(command)
+        return commands
+
+    def stats(self):
+        return {
+            "blind_moves": self.blind_moves,
+            "relay_toggles": self.relay_toggles,
+            "steps_moved": self.steps_moved,
+            "blocking_time": self.blocking_time,
+            "superseded": self.blind.superseded + self.relay.superseded,
+        }
+
+
+# === STEP 3: Firmware Baseline (current main.cpp behaviour) ===
+def naive_stats(light_outside, light_inside):
+    closed = light_outside > THRESHOLD_OUTSIDE
+    relay = light_inside < THRESHOLD_INSIDE
+    blind_moves = int(closed[0]) + int(np.count_nonzero(closed[1:] != closed[:-1]))
+    relay_toggles = int(relay[0]) + int(np.count_nonzero(relay[1:] != relay[:-1]))
+    steps = blind_moves * STEPS_PER_REVOLUTION
+    return {
+        "blind_moves": blind_moves,
+        "relay_toggles": relay_toggles,
+        "steps_moved": steps,
+        "blocking_time": steps / STEPPER_SPEED,
+        "superseded": 0,
+    }
+
+
+# === STEP 4: Replay Recorded Data ===
+def replay_light_data(filename="light_data.csv", outside_scale=3000,
+                      inside_scale=2400, period=LOOP_PERIOD, dwell=True):
+    # light_data.csv holds one normalized channel; scale it to 12-bit ADC
+    # counts so it straddles both firmware thresholds.
+    intensity = np.loadtxt(filename, delimiter=",", skiprows=1)
+    light_outside = intensity * outside_scale
+    light_inside = intensity * inside_scale
+
+    if dwell:
+        scheduler = ActuationScheduler(send=lambda command: None)
+    else:
+        scheduler = ActuationScheduler(send=lambda command: None,
+                                       blind_min_dwell=0.0, relay_min_dwell=0.0)
+    for i in range(len(intensity)):
+        scheduler.update(i * period, light_outside[i], light_inside[i])
+
+    return naive_stats(light_outside, light_inside), scheduler.stats()
+
+
+def print_comparison(naive, no_dwell, scheduled):
+    print(f"{'':16}{'firmware':>12}{'no dwell':>12}{'scheduler':>12}")
+    for key in naive:
+        print(f"{key:16}{naive[key]:>12.1f}{no_dwell[key]:>12.1f}"
+              f"{scheduled[key]:>12.1f}")
+
+
+# === RUN ===
+if __name__ == "__main__":
+    # "no dwell" isolates what smoothing + deadbands alone achieve
+    naive, no_dwell = replay_light_data(dwell=False)
+    _, scheduled = replay_light_data()
+    print_comparison(naive, no_dwell, scheduled)
@@ -0,0 +1,166 @@
+import os
+import csv
+import glob
+import time
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from matplotlib.image import imread, imsave
+from scipy.ndimage import uniform_filter
+
+# === CONFIG ===
+INPUT_DIR = "frames"
+OUTPUT_DIR = "frames_out"
+EFFECT = "grayscale"         # none, grayscale, invert, flip, blur
+EXTENSIONS = ("*.png", "*.jpg", "*.bmp")  # Same filter as the file dialog
+WORKERS = os.cpu_count()
+PREFETCH = 8                 # Images read ahead of the workers
+PERCENTILES = (5, 50, 95)
+
+
+# === STEP 1: Load (same normalization as grayscaleSolution.py) ===
+def load_image(path):
+    img = imread(path).astype(np.float32)
+    if img.max() > 1.0:
+        img /= 255.0
+    if img.ndim == 3 and img.shape[2] == 4:
+        img = img[:, :, :3]  # Drop alpha
+    return img
+
+
+# === STEP 2: Effects Writing into Reused Buffers ===
+_buffers = threading.local()
+
+
+def _buffer(shape):
+    # One output array per worker thread and shape, reused across images
+    cache = getattr(_buffers, "cache", None)
+    if cache is None:
+        cache = _buffers.cache = {}
+    buf = cache.get(shape)
+    if buf is None:
+        buf = cache[shape] = np.empty(shape, dtype=np.float32)
+    return buf
+
+
+def apply_effect(img, effect):
+    if effect == "grayscale":
+        if img.ndim == 2:
+            return img
+        return np.mean(img, axis=2, out=_buffer(img.shape[:2]))
+    out = _buffer(img.shape)
+    if effect == "invert":
+        return np.subtract(1.0, img, out=out)
+    if effect == "flip":
+        out[...] = img[:, ::-1]
+        return out
+    if effect == "blur":
+        # Blur all channels at once instead of one uniform_filter per channel
+        size = (5, 5, 1) if img.ndim == 3 else 5
+        return uniform_filter(img, size=size, output=out)
+    return img
+
+
+def brightness_stats(img):
+    luminance = img if img.ndim == 2 else np.mean(img, axis=2, out=_buffer(img.shape[:2]))
+    return (float(luminance.mean()),
+            *np.percentile(luminance, PERCENTILES).tolist())
+
+
+def process_image(path, img, effect, output_dir):
+    # Illumination of the frame itself, taken before the effect can reuse
+    # the luminance buffer
+    stats = brightness_stats(img)
+    edited = apply_effect(img, effect)
+    if output_dir:
+        # Clip inside the worker's buffer; effects that pass the image
+        # through unchanged get copied into it rather than clipped in place
+        out = edited if edited is not img else _buffer(img.shape)
+        np.clip(edited, 0, 1, out=out)
+        # Keep the source extension so a.jpg and a.png do not collide
+        name = os.path.basename(path) + ".png"
+        imsave(os.path.join(output_dir, name), out,
+               cmap="gray" if out.ndim == 2 else None)
+    return (os.path.basename(path), *stats)
+
+
+# === STEP 3: Batch Pipeline ===
+def list_images(input_dir=INPUT_DIR):
+    paths = []
+    for pattern in EXTENSIONS:
+        paths.extend(glob.glob(os.path.join(input_dir, pattern)))
+    return sorted(paths)
+
+
+def process_folder(input_dir=INPUT_DIR, output_dir=OUTPUT_DIR, effect=EFFECT,
+                   workers=WORKERS, prefetch=PREFETCH):
+    """Stream a folder through one effect.
+
+    Returns (rows, images_per_second, failed); unreadable or corrupt files
+    are listed in `failed` as (name, error) and the batch carries on.
+    """
+    paths = list_images(input_dir)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+
+    rows = []
+    failed = []
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=prefetch) as readers, \
+         ThreadPoolExecutor(max_workers=workers) as pool:
+        loading = deque()
+        running = deque()
+        pending_paths = iter(paths)
+
+        def _refill():
+            for path in pending_paths:
+                loading.append((path, readers.submit(load_image, path)))
+                if len(loading) >= prefetch:
+                    break
+
+        _refill()
+        while loading or running:
+            # Bound in-flight work so memory stays flat on large folders
+            while loading and len(running) < 2 * workers:
+                path, future = loading.popleft()
+                _refill()
+                try:
+                    img = future.result()
+                except Exception as e:
+                    failed.append((os.path.basename(path), e))
+                    continue
+                running.append((path, pool.submit(process_image, path, img,
+                                                  effect, output_dir)))
+            if not running:
+                continue
+            path, future = running.popleft()
+            try:
+                rows.append(future.result())
+            except Exception as e:
+                failed.append((os.path.basename(path), e))
+
+    elapsed = time.perf_counter() - start
+    rate = len(rows) / elapsed if elapsed > 0 else 0.0
+    return rows, rate, failed
+
+
+def write_table(rows, filename):
+    with open(filename, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["file", "mean", *(f"p{p}" for p in PERCENTILES)])
+        for name, *values in rows:
+            writer.writerow([name, *(f"{v:.6f}" for v in values)])
+
+
+# === RUN ===
+if __name__ == "__main__":
+    rows, rate, failed = process_folder()
+    table = os.path.join(OUTPUT_DIR, "brightness.csv")
+    write_table(rows, table)
+    print(f"Processed {len(rows)} images ({EFFECT}) at {rate:.1f} images/s")
+    for name, error in failed:
+        print(f"Skipped {name}: {error}")
+    if failed:
+        print(f"{len(failed)} files could not be processed")
+    print(f"Brightness table written to {table}")
@@ -3,14 +3,18 @@ import numpy as np
 import matplotlib.pyplot as plt
 from itom import dataObject
 import serial
+from outlierfilter import hampel_filter
+from recordingwriter import RecordingWriter
 
 # === CONFIG ===
 SERIAL_PORT = "COM6"         # Change this to match your actual port
 BAUD_RATE = 115200
 NUM_SAMPLES = 100            # Number of readings to collect
+RECORD = True                # Save the raw readings while they arrive
+RECORD_PREFIX = "calibration_raw"  # Segments: calibration_raw_0000.csv.gz, ...
 
 # === STEP 1: Receive Data from ESP32 ===
-def read_esp32_data():
+def read_esp32_data(recorder=None):
     ser = serial.Serial(SERIAL_PORT, BAUD_RATE, timeout=1)
     time.sleep(2)  # Wait for ESP32 to reset
 
@@ -23,6 +27,8 @@ def read_esp32_data():
             if line.isdigit():
                 light = int(line)
                 light_values.append(light)
+                if recorder is not None:
+                    recorder.write([light])  # Queued, written in the background
                 print(f"Received: {light}")
         except Exception as e:
             print("Error:", e)
@@ -59,7 +65,14 @@ def plot_light_data(time_axis, light_values):
 def run_calibration():
     print("=== START CALIBRATION ===")
     
-    raw_data = read_esp32_data()
+    if RECORD:
+        with RecordingWriter(prefix=RECORD_PREFIX) as recorder:
+            raw_data = read_esp32_data(recorder)
+        print(f"Raw readings saved to {', '.join(recorder.segments)}")
+    else:
+        raw_data = read_esp32_data()
+    raw_data, outliers = hampel_filter(raw_data)
+    print(f"Replaced {np.count_nonzero(outliers)} outlier samples.")
     calibrated_data = calibrate_values(raw_data)
     
     print("Light value of the room acquired.")
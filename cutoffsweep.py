@@ -0,0 +1,275 @@
+import bisect
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from scipy.signal import butter, filtfilt
+
+# === CONFIG ===
+Fs = 2_000_000               # 2 MHz sampling rate
+CUTOFF_MIN = 1000            # Same range as the viewer sliders
+CUTOFF_MAX = 0.99 * Fs / 2   # butter() needs a cutoff strictly below Nyquist
+GRID_POINTS = 32             # Most grid anchors; fewer if MAX_BYTES is short
+REFINE_RATIO = 1.02          # Finest step of the refinement lattice
+MAX_RATIO = 1.05             # Only reuse results this close to the request
+NEIGHBOURHOOD = MAX_RATIO**4  # Refinements further away are cancelled
+EVICT_COOLDOWN = 2.0         # s before an evicted cutoff may be recomputed
+MAX_BYTES = 256 * 2**20      # Memory budget for cached results
+WORKERS = None               # None = one per CPU
+
+
+# === STEP 1: Worker Side ===
+_signal = None
+
+
+def _init_worker(signal):
+    # The signal is sent once per worker instead of once per task
+    global _signal
+    _signal = signal
+
+
+def _filter_worker(cutoff, btype, fs, order):
+    b, a = butter(order, cutoff / (0.5 * fs), btype=btype)
+    return filtfilt(b, a, _signal)
+
+
+# === STEP 2: Sweep Cache ===
+class CutoffSweep:
+    """Filters a signal for a log-spaced grid of cutoffs on a process pool.
+
+    MAX_BYTES is split into result slots of one signal each: half of them
+    (up to GRID_POINTS) hold grid anchors that are never evicted, the rest
+    an LRU of refinements. Refinements lie on the grid's own log lattice,
+    each grid step divided evenly so the refinement slots span about two grid
+    steps (never finer than REFINE_RATIO), and a refined cutoff never
+    duplicates an anchor under another float.
+
+    lookup() answers from the cache only, and only from cutoffs within
+    MAX_RATIO of the requested one (snapping or interpolating); nearest()
+    gives the closest cached cutoff, however far, for an approximate view.
+    Each lookup refines the lattice around the slider position with at most
+    one job in flight, and cancels refinements the slider has left.
+    """
+
+    def __init__(self, signal, btype="low", fs=Fs, order=4,
+                 cutoff_min=CUTOFF_MIN, cutoff_max=CUTOFF_MAX,
+                 grid_points=GRID_POINTS, max_bytes=MAX_BYTES, workers=WORKERS):
+        self.signal = np.asarray(signal, dtype=float)
+        self.btype = btype
+        self.fs = fs
+        self.order = order
+        self.cutoff_min = cutoff_min
+        self.cutoff_max = min(cutoff_max, 0.99 * fs / 2)
+
+        # Two anchors are kept even if they alone overrun max_bytes
+        slots = max(2, int(max_bytes // max(self.signal.nbytes, 1)))
+        grid_points = int(np.clip(slots // 2, 2, grid_points))
+        self.refine_slots = slots - grid_points
+        grid_step = np.log(self.cutoff_max / self.cutoff_min) / (grid_points - 1)
+        # The refinement slots cover about two grid steps of the lattice
+        finest = int(np.ceil(grid_step / np.log(REFINE_RATIO)))
+        self.subdivisions = int(np.clip(self.refine_slots // 2, 1, finest))
+        self.step = grid_step / self.subdivisions
+        self.anchors = {self._point(i * self.subdivisions)
+                        for i in range(grid_points)}
+
+        self.lock = threading.Lock()
+        self.cache = {}              # cutoff -> filtered signal
+        self.cache_bytes = 0
+        self.refined = OrderedDict()  # Cached refinement cutoffs, LRU order
+        self.pending = {}            # cutoff -> future
+        self.refining = set()        # Pending cutoffs that lookup() asked for
+        self.evicted = {}            # cutoff -> time it left the cache
+        self.ready = []              # Sorted cutoffs currently in the cache
+        self.jobs = 0
+        self.cancelled = 0
+        self.hits = 0
+        self.misses = 0
+
+        self.pool = ProcessPoolExecutor(max_workers=workers,
+                                        initializer=_init_worker,
+                                        initargs=(self.signal,))
+        for cutoff in sorted(self.anchors):
+            self._submit(cutoff)
+
+    def close(self):
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+    def busy(self):
+        with self.lock:
+            return bool(self.pending)
+
+    # --- Background computation ---
+    def _submit(self, cutoff, refine=False):
+        with self.lock:
+            if cutoff in self.cache or cutoff in self.pending:
+                return False
+            evicted_at = self.evicted.get(cutoff)
+            if evicted_at is not None and time.monotonic() - evicted_at < EVICT_COOLDOWN:
+                return False  # Just evicted; recomputing it now would thrash
+            future = self.pool.submit(_filter_worker, cutoff, self.btype,
+                                      self.fs, self.order)
+            self.pending[cutoff] = future
+            if refine:
+                self.refining.add(cutoff)
+            self.jobs += 1
+        future.add_done_callback(lambda f, c=cutoff: self._store(c, f))
+        return True
+
+    def _store(self, cutoff, future):
+        with self.lock:
+            if self.pending.get(cutoff) is future:
+                del self.pending[cutoff]
+                self.refining.discard(cutoff)
+            if future.cancelled():
+                self.cancelled += 1
+                return
+            if future.exception() is not None:
+                return
+            result = future.result()
+            self.cache[cutoff] = result
+            self.cache_bytes += result.nbytes
+            self.evicted.pop(cutoff, None)
+            bisect.insort(self.ready, cutoff)
+            if cutoff in self.anchors:
+                return
+            # Refinements only ever push out other refinements
+            self.refined[cutoff] = True
+            while len(self.refined) > self.refine_slots:
+                evicted_cutoff, _ = self.refined.popitem(last=False)
+                self.cache_bytes -= self.cache.pop(evicted_cutoff).nbytes
+                self.ready.remove(evicted_cutoff)
+                self.evicted[evicted_cutoff] = time.monotonic()
+
+    def _point(self, k):
+        # k-th lattice point; every `subdivisions`-th one is a grid anchor
+        return float(min(self.cutoff_min * np.exp(k * self.step), self.cutoff_max))
+
+    def _lattice(self, cutoff):
+        k = np.log(cutoff / self.cutoff_min) / self.step
+        points = {self._point(int(np.floor(k))), self._point(int(np.ceil(k)))}
+        # Nearest first
+        return sorted(points, key=lambda c: abs(np.log(c / cutoff)))
+
+    def _refine(self, cutoff):
+        if not self.refine_slots:
+            return
+        with self.lock:
+            # Queued refinements the slider has moved away from
+            stale = [self.pending[c] for c in self.refining
+                     if abs(np.log(c / cutoff)) > np.log(NEIGHBOURHOOD)]
+            points = self._lattice(cutoff)
+            in_flight = any(c in self.refining for c in points)
+        # Cancelling runs _store() synchronously, so not under the lock
+        for future in stale:
+            future.cancel()
+        if in_flight:
+            return  # One job in flight per bracket
+        for c in points:
+            if self._submit(c, refine=True):
+                return
+
+    def _get(self, cutoff):
+        if cutoff in self.refined:
+            self.refined.move_to_end(cutoff)
+        return self.cache[cutoff]
+
+    @staticmethod
+    def _bracket(values, cutoff):
+        i = bisect.bisect_left(values, cutoff)
+        lo = values[i - 1] if i > 0 else None
+        hi = values[i] if i < len(values) else None
+        if hi == cutoff:
+            lo = cutoff
+        return lo, hi
+
+    # --- Lookup from the GUI thread ---
+    def lookup(self, cutoff, interpolate=True):
+        """Return (filtered, used_cutoff) from the cache, or (None, None)."""
+        cutoff = float(np.clip(cutoff, self.cutoff_min, self.cutoff_max))
+
+        def near(c):
+            return c is not None and abs(np.log(c / cutoff)) <= np.log(MAX_RATIO)
+
+        with self.lock:
+            lo, hi = self._bracket(self.ready, cutoff)
+            lo = lo if near(lo) else None
+            hi = hi if near(hi) else None
+            lo_result = self._get(lo) if lo is not None else None
+            hi_result = self._get(hi) if hi is not None else None
+
+        if lo_result is None or hi_result is None:
+            self._refine(cutoff)
+
+        if lo_result is None and hi_result is None:
+            self.misses += 1
+            return None, None
+        self.hits += 1
+        # Snap to whichever close neighbour is available
+        if hi_result is None:
+            return lo_result, lo
+        if lo_result is None or lo == hi:
+            return hi_result, hi
+        # Position between the neighbours on a log-frequency axis
+        w = np.log(cutoff / lo) / np.log(hi / lo)
+        if not interpolate:
+            return (lo_result, lo) if w < 0.5 else (hi_result, hi)
+        return (1 - w) * lo_result + w * hi_result, cutoff
+
+    def nearest(self, cutoff):
+        """Return (filtered, used_cutoff) for the closest cached cutoff at any
+        distance, or (None, None) while the cache is still empty."""
+        cutoff = float(np.clip(cutoff, self.cutoff_min, self.cutoff_max))
+        with self.lock:
+            candidates = [c for c in self._bracket(self.ready, cutoff) if c is not None]
+            if not candidates:
+                return None, None
+            used = min(candidates, key=lambda c: abs(np.log(c / cutoff)))
+            return self._get(used), used
+
+    def wait(self):
+        # Block until everything submitted so far is cached (for scripts)
+        while True:
+            with self.lock:
+                futures = list(self.pending.values())
+            if not futures:
+                return
+            for future in futures:
+                future.exception()
+
+
+# === RUN ===
+if __name__ == "__main__":
+    intensity = np.loadtxt("light_data.csv", delimiter=",", skiprows=1)
+    signal_raw = np.tile(intensity, 250)   # 1M samples
+
+    start = time.perf_counter()
+    sweep = CutoffSweep(signal_raw, btype="low")
+    sweep.wait()
+    print(f"Grid of {len(sweep.anchors)} anchors ready in "
+          f"{time.perf_counter() - start:.2f} s, {sweep.refine_slots} refinement "
+          f"slots, lattice step {np.exp(sweep.step):.4f}")
+
+    # Simulated scrubbing back and forth across part of the range
+    start = time.perf_counter()
+    for n in range(5):
+        hits, approximate = sweep.hits, 0
+        for cutoff in np.linspace(20_000, 80_000, 200)[::1 if n % 2 == 0 else -1]:
+            filtered, _ = sweep.lookup(cutoff)
+            if filtered is None:
+                filtered, _ = sweep.nearest(cutoff)
+                approximate += filtered is not None
+            time.sleep(0.01)     # Roughly the rate of slider events
+        print(f"Pass {n + 1}: {sweep.hits - hits} hits, {approximate} approximate")
+    per_lookup = (time.perf_counter() - start) / 1000 - 0.01
+    print(f"Lookup: {per_lookup * 1e3:.2f} ms, {sweep.jobs} jobs submitted, "
+          f"{sweep.cancelled} stale refinements cancelled, anchors cached: "
+          f"{sweep.anchors <= sweep.cache.keys()}, "
+          f"{sweep.cache_bytes / 2**20:.0f} MiB cached")
+
+    direct_start = time.perf_counter()
+    b, a = butter(4, 50_000 / (0.5 * Fs), btype="low")
+    filtfilt(b, a, signal_raw)
+    print(f"Direct filtfilt: {(time.perf_counter() - direct_start) * 1e3:.2f} ms")
+    sweep.close()
@@ -5,11 +5,13 @@ from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import tkinter as tk
 from tkinter import ttk
 import gc  # Helps ITOM clear old objects
+from cutoffsweep import CutoffSweep
 
 # --- Load CSV Data ---
 filename = r"C:\Users\emily\OneDrive\Desktop\light_data.csv"
 signal_raw = np.loadtxt(filename, delimiter=",", skiprows=1)
 Fs = 2_000_000  # 2 MHz sampling rate
+REFRESH_MS = 100  # Poll for background results while showing an approximation
 
 def apply_lowpass(data, cutoff, fs=Fs, order=4):
     nyq = 0.5 * fs
@@ -38,21 +40,59 @@ class LowPassApp:
         self.canvas = FigureCanvasTkAgg(self.fig, master)
         self.canvas.get_tk_widget().pack()
 
+        # Background sweep: slider moves are answered from cached cutoffs
+        self.sweep = CutoffSweep(signal_raw, btype="low", fs=Fs)
+        self.line = None
+        self.refresh_id = None
+        master.protocol("WM_DELETE_WINDOW", self.on_close)
+
         # Initial plot
         self.update_plot(self.cutoff_default)
 
     def on_slider_change(self, value):
         cutoff = int(float(value))
-        self.label.config(text=f"Cutoff Frequency: {cutoff:,} Hz")
         self.update_plot(cutoff)
 
+    def on_close(self):
+        if self.refresh_id is not None:
+            self.master.after_cancel(self.refresh_id)
+        self.sweep.close()
+        self.master.destroy()
+
+    def refresh(self):
+        self.refresh_id = None
+        self.update_plot(int(float(self.slider.get())))
+
     def update_plot(self, cutoff):
         if not hasattr(self, "ax"):
             print("Axes not initialized yet.")
             return
-        filtered = apply_lowpass(signal_raw, cutoff)
+        filtered, used = self.sweep.lookup(cutoff)
+        approximate = filtered is None
+        if approximate:
+            # Never filter on the Tk thread: show the closest cached cutoff
+            # and redraw once the sweep has refined around this one
+            filtered, used = self.sweep.nearest(cutoff)
+            if self.refresh_id is None and self.sweep.busy():
+                self.refresh_id = self.master.after(REFRESH_MS, self.refresh)
+        text = f"Cutoff Frequency: {cutoff:,} Hz"
+        if filtered is None:
+            self.label.config(text=text + " (computing...)")
+            return
+        if approximate:
+            text += f" (approximate, showing {used:,.0f} Hz)"
+        elif round(used) != cutoff:
+            text += f" (showing cached {used:,.0f} Hz)"
+        self.label.config(text=text)
+        if self.line is not None:
+            # Only the data changes while scrubbing
+            self.line.set_ydata(filtered)
+            self.ax.relim()
+            self.ax.autoscale_view()
+            self.canvas.draw_idle()
+            return
         self.ax.clear()
-        self.ax.plot(filtered, lw=0.5)
+        (self.line,) = self.ax.plot(filtered, lw=0.5)
         self.ax.set_title("Filtered Signal")
         self.ax.set_xlabel("Sample Index")
         self.ax.set_ylabel("Amplitude")
@@ -66,5 +106,6 @@ def run_gui():
     app = LowPassApp(root)
     root.mainloop()
 
-# Run GUI in ITOM
-run_gui()
+# Run GUI in ITOM (guarded: sweep worker processes re-import this script)
+if __name__ == "__main__":
+    run_gui()
@@ -0,0 +1,190 @@
+import re
+import time
+import threading
+import numpy as np
+import matplotlib.pyplot as plt
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+import tkinter as tk
+import gc
+
+# === CONFIG ===
+SERIAL_PORT = "COM6"         # Change this to match your actual port
+BAUD_RATE = 115200
+WINDOW = 500                 # Samples visible in the scrolling window
+FRAME_RATE = 20              # Redraws per second, independent of data rate
+ADC_MAX = 4095               # ESP32 12-bit ADC
+
+# Line format printed by main.cpp: "Outside: 1234 | Inside: 567"
+LINE_PATTERN = re.compile(r"Outside:\s*(\d+)\s*\|\s*Inside:\s*(\d+)")
+
+
+# === STEP 1: Sample Sources (run on the acquisition thread) ===
+def serial_source(port=SERIAL_PORT, baud=BAUD_RATE):
+    import serial
+
+    ser = serial.Serial(port, baud, timeout=1)
+    time.sleep(2)  # Wait for ESP32 to reset
+    try:
+        while True:
+            try:
+                line = ser.readline().decode(errors="ignore")
+            except Exception as e:
+                print("Error:", e)
+                continue
+            match = LINE_PATTERN.search(line)
+            if match:
+                yield int(match.group(1)), int(match.group(2))
+    finally:
+        ser.close()
+
+
+def csv_source(filename="light_data.csv", rate=200.0):
+    # Replays the single recorded channel as both LDRs at `rate` samples/s
+    intensity = np.loadtxt(filename, delimiter=",", skiprows=1)
+    counts = np.clip(intensity * ADC_MAX, 0, ADC_MAX).astype(int)
+    period = 1.0 / rate
+    next_t = time.perf_counter()
+    for value in counts:
+        yield value, value
+        next_t += period
+        delay = next_t - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+
+
+def start_acquisition(source, buffer):
+    # Each sample is an O(1) ring-buffer write; the reader never waits on the GUI
+    def _acquire():
+        for sample in source:
+            buffer.append(sample)
+
+    thread = threading.Thread(target=_acquire, daemon=True)
+    thread.start()
+    return thread
+
+
+# === STEP 2: Scrolling Ring Buffer with Running Calibration ===
+class ScrollingBuffer:
+    """Fixed-size ring written by the acquisition thread, read once per frame.
+
+    Memory and per-frame work depend only on the window size, never on how
+    fast samples arrive.
+    """
+
+    def __init__(self, window=WINDOW, channels=2):
+        self.raw = np.full((window, channels), np.nan)
+        self.min_val = np.full(channels, np.inf)
+        self.max_val = np.full(channels, -np.inf)
+        self.pos = 0
+        self.count = 0
+        self.lock = threading.Lock()
+
+    def append(self, sample):
+        with self.lock:
+            self.raw[self.pos] = sample
+            np.minimum(self.min_val, self.raw[self.pos], out=self.min_val)
+            np.maximum(self.max_val, self.raw[self.pos], out=self.max_val)
+            self.pos = (self.pos + 1) % len(self.raw)
+            self.count += 1
+
+    def snapshot(self):
+        # Only plain copies happen under the lock, so append() is never held
+        # up by the reordering or calibration done for the GUI
+        with self.lock:
+            raw = self.raw.copy()
+            pos = self.pos
+            min_val = self.min_val.copy()
+            max_val = self.max_val.copy()
+            count = self.count
+        raw = np.roll(raw, -pos, axis=0)  # Oldest sample first
+        return raw, calibrate(raw, min_val, max_val), count
+
+
+def calibrate(raw, min_val, max_val):
+    # Same linear [0, 1000] scaling as calibration.calibrate_values,
+    # using the range seen so far
+    span = max_val - min_val
+    span[span == 0] = 1.0
+    return 1000 * (raw - min_val) / span
+
+
+# === STEP 3: Live Dashboard ===
+class LiveDashboardApp:
+    def __init__(self, master, buffer):
+        self.master = master
+        self.buffer = buffer
+        self.drawn_count = 0
+        master.title("Live Light Intensity")
+
+        x = np.arange(WINDOW)
+
+        self.fig = plt.Figure(figsize=(7, 5), dpi=100)
+        self.ax_raw = self.fig.add_subplot(211)
+        self.ax_cal = self.fig.add_subplot(212, sharex=self.ax_raw)
+
+        self.lines = []
+        for ax, y_max, title in ((self.ax_raw, ADC_MAX, "Raw ADC Value"),
+                                 (self.ax_cal, 1000, "Calibrated Light Value")):
+            for name in ("Outside", "Inside"):
+                (line,) = ax.plot(x, np.full(WINDOW, np.nan), lw=0.8,
+                                  label=name, animated=True)
+                self.lines.append(line)
+            ax.set_xlim(0, WINDOW - 1)
+            ax.set_ylim(0, y_max)
+            ax.set_ylabel(title)
+            ax.grid(True)
+            ax.legend(loc="upper left")
+        self.ax_cal.set_xlabel("Sample (most recent on the right)")
+        self.status = self.ax_raw.text(0.99, 0.95, "", ha="right", va="top",
+                                       transform=self.ax_raw.transAxes,
+                                       animated=True)
+        self.fig.tight_layout()
+
+        self.canvas = FigureCanvasTkAgg(self.fig, master)
+        self.canvas.get_tk_widget().pack(fill="both", expand=True)
+        self.background = None
+        self.canvas.mpl_connect("draw_event", self.on_draw)
+        self.canvas.draw()
+
+        self.frame_ms = int(1000 / FRAME_RATE)
+        self.master.after(self.frame_ms, self.on_frame)
+
+    def on_draw(self, event):
+        # Static parts (axes, grid, legend) are cached and restored each frame
+        self.background = self.canvas.copy_from_bbox(self.fig.bbox)
+        self.draw_artists()
+
+    def on_frame(self):
+        start = time.perf_counter()
+        if self.buffer.count != self.drawn_count and self.background is not None:
+            raw, cal, count = self.buffer.snapshot()
+            self.drawn_count = count
+            for i, line in enumerate(self.lines):
+                data = raw if i < 2 else cal
+                line.set_ydata(data[:, i % 2])
+            self.status.set_text(f"{count} samples")
+            self.canvas.restore_region(self.background)
+            self.draw_artists()
+            self.canvas.blit(self.fig.bbox)
+        # Schedule the next frame relative to the fixed frame period
+        elapsed_ms = int(1000 * (time.perf_counter() - start))
+        self.master.after(max(1, self.frame_ms - elapsed_ms), self.on_frame)
+
+    def draw_artists(self):
+        for line in self.lines:
+            line.axes.draw_artist(line)
+        self.ax_raw.draw_artist(self.status)
+
+
+# === RUN ===
+def run_dashboard(source=None):
+    gc.collect()  # Clear old Tkinter windows in ITOM
+    buffer = ScrollingBuffer()
+    start_acquisition(source if source is not None else serial_source(), buffer)
+    root = tk.Tk()
+    app = LiveDashboardApp(root, buffer)
+    root.mainloop()
+
+
+if __name__ == "__main__":
+    run_dashboard()
@@ -0,0 +1,109 @@
+import time
+import numpy as np
+from scipy.ndimage import median_filter
+
+# === CONFIG ===
+HALF_WINDOW = 15             # Window is 2 * HALF_WINDOW + 1 samples
+N_SIGMAS = 4.0               # Replace samples further than this from the median
+MAD_SCALE = 1.4826           # MAD -> standard deviation for Gaussian noise
+MIN_DEV = 3.0                # Never replace deviations below this (ADC counts)
+Fs = 2_000_000               # 2 MHz sampling rate
+
+
+# === STEP 1: Vectorized Hampel Filter ===
+def rolling_median(x, half_window=HALF_WINDOW):
+    # scipy's 1-D rank filter keeps a sorted window, O(n log w), in C
+    return median_filter(x, size=2 * half_window + 1, mode="nearest")
+
+
+def hampel_filter(x, half_window=HALF_WINDOW, n_sigmas=N_SIGMAS, min_dev=MIN_DEV):
+    """Replace outliers by the rolling median.
+
+    Unlike the textbook Hampel filter, the spread is not the MAD of each
+    window around its own centre median. It is the rolling median of
+    |x[j] - median[j]|, i.e. of every sample's deviation from its own rolling
+    median, which keeps the whole filter to two sliding-window medians. The
+    threshold never drops below `min_dev`, so flat integer ADC data (MAD 0)
+    keeps its 1-count noise. Returns (filtered, replaced_mask).
+    """
+    x = np.asarray(x, dtype=float)
+    med = rolling_median(x, half_window)
+    dev = np.abs(x - med)
+    mad = rolling_median(dev, half_window)
+    outliers = dev > np.maximum(n_sigmas * MAD_SCALE * mad, min_dev)
+    return np.where(outliers, med, x), outliers
+
+
+# === STEP 2: Streaming Version for Chunked Input ===
+class StreamingHampel:
+    """Hampel filter over a stream of chunks.
+
+    Output lags the input by 2 * half_window samples (the reach of the two
+    medians); the concatenated output equals hampel_filter() on the whole
+    stream once flush() has been called.
+    """
+
+    def __init__(self, half_window=HALF_WINDOW, n_sigmas=N_SIGMAS, min_dev=MIN_DEV):
+        self.half_window = half_window
+        self.n_sigmas = n_sigmas
+        self.min_dev = min_dev
+        self.tail = np.array([])
+        self.skip = 0        # Leading tail samples already emitted
+        self.replaced = 0
+        self.processed = 0
+
+    def process(self, chunk):
+        ext = np.concatenate([self.tail, np.asarray(chunk, dtype=float)])
+        reach = 2 * self.half_window
+        end = max(len(ext) - reach, self.skip)
+        out = self._emit(ext, end)
+
+        start = max(0, end - reach)
+        self.tail = ext[start:]
+        self.skip = end - start
+        return out
+
+    def flush(self):
+        out = self._emit(self.tail, len(self.tail))
+        self.tail = np.array([])
+        self.skip = 0
+        return out
+
+    def _emit(self, ext, end):
+        if end <= self.skip:
+            return np.array([])
+        filtered, outliers = hampel_filter(ext, self.half_window, self.n_sigmas,
+                                           self.min_dev)
+        self.replaced += int(np.count_nonzero(outliers[self.skip:end]))
+        self.processed += end - self.skip
+        return filtered[self.skip:end]
+
+
+# === RUN ===
+if __name__ == "__main__":
+    intensity = np.loadtxt("light_data.csv", delimiter=",", skiprows=1)
+
+    # Inject ADC spikes / bad serial lines into a copy of the recording
+    rng = np.random.default_rng(0)
+    noisy = intensity.copy()
+    spikes = rng.choice(len(noisy), size=40, replace=False)
+    noisy[spikes] += rng.choice([-1, 1], size=40) * rng.uniform(0.5, 3.0, size=40)
+
+    # light_data.csv is normalized, so the floor is in those units too
+    reference, _ = hampel_filter(noisy, min_dev=0.01)
+    stream = StreamingHampel(min_dev=0.01)
+    chunks = [stream.process(c) for c in np.array_split(noisy, 37)]
+    streamed = np.concatenate(chunks + [stream.flush()])
+    print(f"Replaced {stream.replaced} of {stream.processed} samples "
+          f"({len(spikes)} injected)")
+    print("Chunked output matches one-shot:", np.array_equal(streamed, reference))
+
+    # Throughput on 2 MHz-sized blocks
+    block = rng.normal(size=Fs)
+    stream = StreamingHampel()
+    start = time.perf_counter()
+    for _ in range(5):
+        stream.process(block)
+    elapsed = time.perf_counter() - start
+    print(f"Throughput: {stream.processed / elapsed / 1e6:.1f} MS/s "
+          f"({stream.processed / elapsed / Fs:.1f}x real time at 2 MHz)")
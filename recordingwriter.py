@@ -0,0 +1,233 @@
+import io
+import os
+import glob
+import gzip
+import time
+import zlib
+import queue
+import threading
+import numpy as np
+
+# === CONFIG ===
+OUTPUT_PREFIX = "recording"   # Segments: recording_0000.csv(.gz), ...
+COLUMNS = ("light_intensity",)  # Same header as light_data.csv
+BATCH_SAMPLES = 50_000        # Flush once this many samples are buffered
+QUEUE_SAMPLES = BATCH_SAMPLES  # Samples allowed to wait for the writer thread
+FLUSH_INTERVAL = 1.0          # ...or after this many seconds
+SEGMENT_SAMPLES = 5_000_000   # Rotate to a new file after this many samples
+COMPRESS = True               # gzip segments
+POLICY = "block"              # "block" = backpressure, "drop" = count and drop
+
+
+# === STEP 1: Background Writer ===
+class RecordingWriter:
+    """Writes sample blocks to rotating segment files on a background thread.
+
+    Every batch is appended and fsync'd on its own (as a separate gzip member
+    when compressed). What a killed process loses is what has not reached
+    disk yet: up to queue_samples waiting in the queue plus the batch being
+    collected or written (batch_samples, one block more at most). With the
+    defaults that is about two batches, 100k samples.
+    """
+
+    def __init__(self, prefix=OUTPUT_PREFIX, columns=COLUMNS,
+                 queue_samples=QUEUE_SAMPLES, batch_samples=BATCH_SAMPLES,
+                 flush_interval=FLUSH_INTERVAL, segment_samples=SEGMENT_SAMPLES,
+                 compress=COMPRESS, policy=POLICY):
+        if policy not in ("block", "drop"):
+            raise ValueError(f"Unknown policy: {policy}")
+        self.prefix = prefix
+        self.columns = columns
+        self.batch_samples = batch_samples
+        self.flush_interval = flush_interval
+        self.segment_samples = segment_samples
+        self.compress = compress
+        self.policy = policy
+
+        # Bounded in samples, not blocks, so the loss bound does not depend
+        # on how the producer sizes its blocks
+        self.queue = queue.Queue()
+        self.queue_samples = queue_samples
+        self.queued_samples = 0
+        self._space = threading.Condition()
+        self.dropped_blocks = 0
+        self.dropped_samples = 0
+        self.written_samples = 0
+        self.segments = []
+        self.error = None
+
+        self._segment_index = 0
+        self._segment_fill = 0
+        self._file = None
+        self._stop = object()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    # --- Producer side ---
+    def write(self, block):
+        block = np.asarray(block, dtype=float)
+        with self._space:
+            if self.policy == "block":
+                while self._full(len(block)) and self.error is None:
+                    self._space.wait()
+            if self.error is not None:
+                # The writer thread has failed; nothing queued now would reach disk
+                self._count_drop(block)
+                raise self.error
+            if self._full(len(block)):
+                self._count_drop(block)
+                return False
+            self.queued_samples += len(block)
+        self.queue.put(block)
+        return True
+
+    def _full(self, n):
+        # An empty queue always takes the block, however large it is
+        return self.queued_samples and self.queued_samples + n > self.queue_samples
+
+    def _count_drop(self, block):
+        self.dropped_blocks += 1
+        self.dropped_samples += len(block)
+
+    def close(self):
+        self.queue.put(self._stop)
+        self._thread.join()
+        if self.error is not None:
+            raise self.error
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # --- Writer thread ---
+    def _run(self):
+        pending = []
+        pending_samples = 0
+        deadline = time.monotonic() + self.flush_interval
+        try:
+            while True:
+                timeout = max(0.0, deadline - time.monotonic())
+                try:
+                    block = self.queue.get(timeout=timeout)
+                except queue.Empty:
+                    block = None
+
+                if block is self._stop:
+                    break
+                if block is not None:
+                    with self._space:
+                        self.queued_samples -= len(block)
+                        self._space.notify_all()
+                if block is not None and len(block):
+                    pending.append(block)
+                    pending_samples += len(block)
+
+                if pending_samples >= self.batch_samples or time.monotonic() >= deadline:
+                    if pending:
+                        self._flush(np.concatenate(pending))
+                    pending = []
+                    pending_samples = 0
+                    deadline = time.monotonic() + self.flush_interval
+
+            if pending:
+                self._flush(np.concatenate(pending))
+        except Exception as e:
+            with self._space:
+                self.error = e
+                self._space.notify_all()  # Wake producers waiting for space
+            # Keep draining so producers using backpressure never hang
+            while self.queue.get() is not self._stop:
+                pass
+        finally:
+            if self._file is not None:
+                self._file.close()
+
+    def _flush(self, batch):
+        while len(batch):
+            if self._file is None:
+                self._open_segment()
+            room = self.segment_samples - self._segment_fill
+            chunk, batch = batch[:room], batch[room:]
+            self._write_batch(chunk)
+            if self._segment_fill >= self.segment_samples:
+                self._file.close()
+                self._file = None
+
+    def _open_segment(self):
+        suffix = ".csv.gz" if self.compress else ".csv"
+        path = f"{self.prefix}_{self._segment_index:04d}{suffix}"
+        self._segment_index += 1
+        self._segment_fill = 0
+        self._file = open(path, "wb")
+        self.segments.append(path)
+        self._append(",".join(self.columns).encode() + b"\n")
+
+    def _write_batch(self, batch):
+        text = io.BytesIO()
+        np.savetxt(text, batch.reshape(len(batch), -1), delimiter=",", fmt="%.10g")
+        self._append(text.getvalue())
+        self._segment_fill += len(batch)
+        self.written_samples += len(batch)
+
+    def _append(self, data):
+        if self.compress:
+            data = gzip.compress(data, compresslevel=1)
+        self._file.write(data)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+
+# === STEP 2: Read Segments Back ===
+def read_segment(path):
+    # Returns only the complete batches; a truncated tail is ignored
+    with open(path, "rb") as f:
+        data = f.read()
+    if path.endswith(".gz"):
+        text = []
+        while data:
+            member = zlib.decompressobj(wbits=31)
+            try:
+                chunk = member.decompress(data)
+            except zlib.error:
+                break
+            if not member.eof:
+                break
+            text.append(chunk)
+            data = member.unused_data
+        data = b"".join(text)
+    data = data[:data.rfind(b"\n") + 1]
+    lines = data.splitlines()[1:]
+    if not lines:
+        return np.array([])
+    return np.loadtxt(lines, delimiter=",", ndmin=1)
+
+
+def segment_paths(prefix=OUTPUT_PREFIX):
+    # Only this recording's own segments, not others sharing the prefix
+    pattern = f"{glob.escape(prefix)}_[0-9][0-9][0-9][0-9].csv*"
+    paths = [p for p in glob.glob(pattern) if p.endswith((".csv", ".csv.gz"))]
+    return sorted(paths, key=lambda p: int(p[len(prefix) + 1:].split(".")[0]))
+
+
+def load_recording(prefix=OUTPUT_PREFIX):
+    paths = segment_paths(prefix)
+    blocks = [read_segment(path) for path in paths]
+    if not blocks:
+        return np.array([])
+    return np.concatenate(blocks)
+
+
+# === RUN ===
+if __name__ == "__main__":
+    data = np.loadtxt("light_data.csv", delimiter=",", skiprows=1)
+    start = time.perf_counter()
+    with RecordingWriter(prefix="recording_demo", batch_samples=1000,
+                         segment_samples=2000) as writer:
+        for block in np.array_split(data, 100):
+            writer.write(block)
+    elapsed = time.perf_counter() - start
+    print(f"Wrote {writer.written_samples} samples to {len(writer.segments)} "
+          f"segments in {elapsed:.3f} s, dropped {writer.dropped_samples}")
+    print("Round trip OK:", np.allclose(load_recording("recording_demo"), data))
@@ -0,0 +1,173 @@
+import sys
+import time
+import numpy as np
+from scipy.signal import butter, sosfilt
+from outlierfilter import hampel_filter
+
+# === CONFIG (mirrors illuminationcontrol.control_light_loop) ===
+COMFORT_LOW = 200            # Acceptable range checked every decision
+COMFORT_HIGH = 500
+DECISION_PERIOD = 1.0        # s, time.sleep(1) in the control loop
+CUTOFF = 2.0                 # Hz, highest causal low-pass before the controller
+CUTOFF_FRACTION = 0.8        # ...and at most this share of the lower Nyquist
+                             # (trace rate or decision rate)
+AMBIENT_SCALE = 600          # Trace value 1.0 -> 600 intensity units
+LAMP_MAX = 400               # Artificial light range the controller drives
+LAMP_STEP = 20               # Change per adjust_light call
+OUTLIER_MIN_DEV = 0.01       # Hampel floor in trace units (traces are normalized)
+
+
+# === STEP 1: Sensor Pipeline on the Virtual Clock ===
+def load_trace(filename="light_data.csv"):
+    return np.loadtxt(filename, delimiter=",", skiprows=1)
+
+
+def decimate_to_period(trace, fs, period=DECISION_PERIOD):
+    """Block-average a trace faster than the decisions down to one value per
+    period; returns (trace, fs). Slower traces are returned unchanged."""
+    factor = int(round(fs * period))
+    if factor <= 1:
+        return trace, fs
+    if len(trace) < factor:
+        return np.array([trace.mean()]), 1.0 / period  # Shorter than one decision
+    usable = len(trace) // factor * factor
+    return trace[:usable].reshape(-1, factor).mean(axis=1), fs / factor
+
+
+def daylight_trace(trace, fs, hours=24.0, period=DECISION_PERIOD):
+    """SYNTHETIC day: the trace tiled to `hours` under an invented sine daylight.
+
+    This exercises the engine at full-day scale; results on it are a demo,
+    not a tuning result on recorded data. Pass real day-long recordings to
+    sense() for that. The day is built at the decision rate at most, so its
+    size does not grow with fs; returns (day, day_fs).
+    """
+    trace, fs = decimate_to_period(trace, fs, period)
+    n = int(hours * 3600 * fs)
+    t = np.arange(n) / fs
+    sun = np.clip(np.sin(np.pi * (t / 3600 - 6) / 12), 0.05, 1.0)
+    return np.resize(trace, n) * sun, fs
+
+
+def default_cutoff(fs, period=DECISION_PERIOD):
+    # Below both the trace's Nyquist and that of the decision ticks, which
+    # would otherwise alias whatever the filter lets through
+    return min(CUTOFF, CUTOFF_FRACTION * 0.5 * min(fs, 1.0 / period))
+
+
+def sense(trace, fs, cutoff=None, period=DECISION_PERIOD):
+    """Outlier rejection + causal low-pass, sampled at each decision time.
+
+    `fs` is the trace's sampling rate in Hz and has no default: recordings in
+    this project are not labelled with one (the filter viewers assume 2 MHz,
+    the actuation scheduler one sample per loop period). `cutoff` defaults to
+    default_cutoff(fs, period).
+    """
+    if cutoff is None:
+        cutoff = default_cutoff(fs, period)
+    if cutoff >= 0.5 * fs:
+        raise ValueError(f"cutoff {cutoff} Hz is not below Nyquist for fs={fs} Hz")
+    clean, _ = hampel_filter(trace, min_dev=OUTLIER_MIN_DEV)
+    sos = butter(4, cutoff / (0.5 * fs), btype="low", output="sos")
+    filtered = sosfilt(sos, clean)
+    ticks = np.arange(0, len(trace) / fs, period)
+    return filtered[(ticks * fs).astype(int)] * AMBIENT_SCALE
+
+
+# === STEP 2: Policy Grid ===
+def policy_grid(lows, highs, hysteresis):
+    low, high, hyst = np.meshgrid(lows, highs, hysteresis, indexing="ij")
+    valid = high - low > 2 * hyst
+    return {"low": low[valid], "high": high[valid], "hysteresis": hyst[valid]}
+
+
+# === STEP 3: Vectorized Simulation ===
+def simulate(ambient, policies):
+    """Run every policy over the same ambient trace at once.
+
+    Each tick a policy either holds or calls adjust_light, which moves the
+    lamp by LAMP_STEP. A policy starts adjusting when the reading leaves
+    [low, high] and keeps going until it is back inside by `hysteresis`.
+    """
+    low = policies["low"]
+    high = policies["high"]
+    hyst = policies["hysteresis"]
+    p = len(low)
+
+    lamp = np.zeros(p)
+    direction = np.zeros(p)          # +1 brighten, -1 dim, 0 hold
+    violations = np.zeros(p, dtype=int)
+    adjust_calls = np.zeros(p, dtype=int)
+    switches = np.zeros(p, dtype=int)
+
+    for ambient_now in ambient:
+        light = ambient_now + lamp
+        violations += (light <= COMFORT_LOW) | (light >= COMFORT_HIGH)
+
+        new_direction = np.where(light < low, 1.0,
+                        np.where(light > high, -1.0, direction))
+        done = ((new_direction > 0) & (light > low + hyst)) | \
+               ((new_direction < 0) & (light < high - hyst))
+        new_direction[done] = 0.0
+        # Nothing left to adjust once the lamp is at either end
+        new_direction[(new_direction > 0) & (lamp >= LAMP_MAX)] = 0.0
+        new_direction[(new_direction < 0) & (lamp <= 0)] = 0.0
+
+        switches += (new_direction != direction) & (new_direction != 0)
+        adjust_calls += new_direction != 0
+        lamp = np.clip(lamp + LAMP_STEP * new_direction, 0, LAMP_MAX)
+        direction = new_direction
+
+    return {"violations": violations * DECISION_PERIOD,
+            "adjust_calls": adjust_calls, "switches": switches}
+
+
+def print_row(policies, results, i):
+    print(f"{policies['low'][i]:>6.0f}{policies['high'][i]:>6.0f}"
+          f"{policies['hysteresis'][i]:>6.0f}{results['violations'][i]:>13.0f}"
+          f"{results['adjust_calls'][i]:>9d}{results['switches'][i]:>10d}")
+
+
+def print_ranking(policies, results, top=10):
+    # Comfort first, then the number of separate actuation episodes
+    order = np.lexsort((results["switches"], results["violations"]))
+    print(f"{'low':>6}{'high':>6}{'hyst':>6}{'violation s':>13}"
+          f"{'adjusts':>9}{'switches':>10}")
+    for i in order[:top]:
+        print_row(policies, results, i)
+
+    # The thresholds control_light_loop uses today
+    current = np.flatnonzero((policies["low"] == COMFORT_LOW) &
+                             (policies["high"] == COMFORT_HIGH) &
+                             (policies["hysteresis"] == 0))
+    if len(current):
+        print("Current control_light_loop policy:")
+        print_row(policies, results, current[0])
+
+
+# === RUN ===
+if __name__ == "__main__":
+    if len(sys.argv) not in (2, 3):
+        sys.exit("usage: python replayengine.py <light_data.csv sampling rate in Hz> "
+                 "[cutoff in Hz]")
+    trace_fs = float(sys.argv[1])
+
+    start = time.perf_counter()
+    day, day_fs = daylight_trace(load_trace(), trace_fs)
+    cutoff = float(sys.argv[2]) if len(sys.argv) == 3 else default_cutoff(day_fs)
+    ambient = sense(day, day_fs, cutoff)
+    sensed = time.perf_counter()
+
+    policies = policy_grid(lows=np.arange(150, 351, 25),
+                           highs=np.arange(350, 551, 25),
+                           hysteresis=np.arange(0, 101, 10))
+    results = simulate(ambient, policies)
+    done = time.perf_counter()
+
+    print("Input is a SYNTHETIC day (tiled light_data.csv under an invented "
+          "daylight curve), not recorded data.")
+    print(f"Sensed at {day_fs:g} Hz with a {cutoff:.3g} Hz low-pass")
+    print(f"Simulated {len(ambient) * DECISION_PERIOD / 3600:.0f} h for "
+          f"{len(policies['low'])} policies: sensing {sensed - start:.2f} s, "
+          f"control {done - sensed:.2f} s")
+    print_ranking(policies, results)
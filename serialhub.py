@@ -0,0 +1,306 @@
+import os
+import re
+import time
+import queue
+import selectors
+import threading
+from collections import namedtuple
+import serial
+
+# === CONFIG ===
+BAUD_RATE = 115200
+RESET_DELAY = 2.0            # s, ESP32 resets when the port is opened
+BACKOFF_MIN = 0.5            # s, first reconnect delay
+BACKOFF_MAX = 30.0           # s, reconnect delay cap
+MAX_LINE = 256               # Longer "lines" are treated as line noise
+READ_SIZE = 4096
+THREAD_READ_TIMEOUT = 0.1    # s, blocking read per port in thread mode
+
+# Example building layout: room id -> serial port
+PORTS = {
+    "room_101": "COM6",          # /dev/ttyUSB0 on a Linux gateway
+    "room_102": "COM7",
+}
+
+# main.cpp prints "Outside: 1234 | Inside: 567"; older sketches a bare number
+LINE_PATTERN = re.compile(rb"Outside:\s*(\d+)\s*\|\s*Inside:\s*(\d+)")
+
+Sample = namedtuple("Sample", ["room", "timestamp", "channels"])
+
+
+def parse_line(line):
+    match = LINE_PATTERN.search(line)
+    if match:
+        return int(match.group(1)), int(match.group(2))
+    line = line.strip()
+    if line.isdigit():
+        return (int(line),)
+    return None
+
+
+# === STEP 1: One Port ===
+class PortReader:
+    """Reader for one board, with its own framing and backoff."""
+
+    def __init__(self, room, port, baud=BAUD_RATE, reset_delay=RESET_DELAY):
+        self.room = room
+        self.port = port
+        self.baud = baud
+        self.reset_delay = reset_delay
+        self.ser = None
+        self.buffer = bytearray()
+        self.resync = True           # Drop bytes up to the next newline
+        self.backoff = BACKOFF_MIN
+        self.next_attempt = 0.0
+        self.ready_at = 0.0
+        self.reconnects = 0
+        self.bad_lines = 0
+
+    def open(self, now, timeout=0):
+        self.ser = serial.Serial(self.port, self.baud, timeout=timeout)
+        self.buffer.clear()
+        self.resync = True
+        # Instead of sleeping, ignore whatever arrives while the board resets
+        self.ready_at = now + self.reset_delay
+
+    def close(self, now, error=None):
+        if self.ser is not None:
+            try:
+                self.ser.close()
+            except (OSError, serial.SerialException):
+                pass
+            self.ser = None
+        if error is not None:
+            print(f"{self.room}: {error}, retrying in {self.backoff:.1f} s")
+            self.next_attempt = now + self.backoff
+            self.backoff = min(self.backoff * 2, BACKOFF_MAX)
+            self.reconnects += 1
+
+    def read(self, now):
+        # Selector path: the port reported readable, so no data means EOF
+        data = self.ser.read(READ_SIZE)
+        if not data:
+            raise serial.SerialException("port closed")
+        return self.feed(now, data)
+
+    def feed(self, now, data):
+        self.backoff = BACKOFF_MIN
+        if now < self.ready_at:
+            return []
+
+        self.buffer += data
+        if self.resync:
+            # The first line after a reset or a cut is only a tail (b"34" of
+            # "1234"), so it is never parsed
+            end = self.buffer.find(b"\n")
+            if end < 0:
+                self.buffer.clear()
+                return []
+            del self.buffer[:end + 1]
+            self.resync = False
+
+        *lines, rest = self.buffer.split(b"\n")
+        if len(rest) > MAX_LINE:
+            self.bad_lines += 1
+            rest = b""
+            self.resync = True
+        self.buffer = bytearray(rest)
+
+        samples = []
+        for line in lines:
+            channels = parse_line(line) if len(line) <= MAX_LINE else None
+            if channels is None:
+                self.bad_lines += 1
+                continue
+            samples.append(Sample(self.room, now, channels))
+        return samples
+
+
+# === STEP 2: Hub ===
+class SerialHub:
+    """Reads many serial ports and merges them into one tagged sample stream.
+
+    On POSIX all ports share one thread and a selector. Windows COM handles
+    cannot be selected, so there (or with use_threads=True) every port gets
+    a reader thread feeding the same stream. Either way ports are opened (and
+    therefore reset) together, failed ports are retried with exponential
+    backoff, and samples come out tagged with their room.
+    """
+
+    def __init__(self, ports=PORTS, baud=BAUD_RATE, reset_delay=RESET_DELAY,
+                 use_threads=None):
+        self.readers = [PortReader(room, port, baud, reset_delay)
+                        for room, port in ports.items()]
+        self.samples_read = 0
+        self.use_threads = os.name != "posix" if use_threads is None else use_threads
+        if self.use_threads:
+            self.batches = queue.SimpleQueue()
+            self.stop = threading.Event()
+            self.threads = [threading.Thread(target=self._read_port, args=(r,),
+                                             daemon=True)
+                            for r in self.readers]
+            for thread in self.threads:
+                thread.start()
+        else:
+            self.selector = selectors.DefaultSelector()
+
+    # --- Thread per port (Windows) ---
+    def _read_port(self, reader):
+        while not self.stop.is_set():
+            now = time.time()
+            if reader.ser is None:
+                if now < reader.next_attempt:
+                    self.stop.wait(reader.next_attempt - now)
+                    continue
+                try:
+                    reader.open(now, timeout=THREAD_READ_TIMEOUT)
+                except (OSError, serial.SerialException) as e:
+                    reader.close(now, e)
+                continue
+            try:
+                data = reader.ser.read(max(1, reader.ser.in_waiting))
+            except (OSError, serial.SerialException) as e:
+                reader.close(time.time(), e)
+                continue
+            if data:
+                batch = reader.feed(time.time(), data)
+                if batch:
+                    self.batches.put(batch)
+        reader.close(time.time())
+
+    def _poll_threads(self, timeout):
+        samples = []
+        try:
+            samples.extend(self.batches.get(timeout=timeout))
+            while True:
+                samples.extend(self.batches.get_nowait())
+        except queue.Empty:
+            pass
+        return samples
+
+    # --- Selector (POSIX) ---
+    def _connect_due(self, now):
+        for reader in self.readers:
+            if reader.ser is None and now >= reader.next_attempt:
+                try:
+                    reader.open(now)
+                except (OSError, serial.SerialException) as e:
+                    reader.close(now, e)
+                    continue
+                self.selector.register(reader.ser.fileno(),
+                                       selectors.EVENT_READ, reader)
+
+    def _drop(self, reader, now, error):
+        self.selector.unregister(reader.ser.fileno())
+        reader.close(now, error)
+
+    def _timeout(self, now, limit):
+        waits = [r.next_attempt - now for r in self.readers if r.ser is None]
+        return max(0.0, min(waits + [limit]))
+
+    def _poll_selector(self, timeout):
+        now = time.time()
+        self._connect_due(now)
+        samples = []
+        for key, _ in self.selector.select(self._timeout(now, timeout)):
+            reader = key.data
+            now = time.time()
+            try:
+                samples.extend(reader.read(now))
+            except (OSError, serial.SerialException) as e:
+                self._drop(reader, now, e)
+        return samples
+
+    def poll(self, timeout=0.1):
+        if self.use_threads:
+            samples = self._poll_threads(timeout)
+        else:
+            samples = self._poll_selector(timeout)
+        self.samples_read += len(samples)
+        return samples
+
+    def stream(self, duration=None):
+        # Yields batches of tagged samples, one batch per poll
+        end = None if duration is None else time.time() + duration
+        while end is None or time.time() < end:
+            batch = self.poll()
+            if batch:
+                yield batch
+
+    def close(self):
+        if self.use_threads:
+            self.stop.set()
+            for thread in self.threads:
+                thread.join()
+            return
+        now = time.time()
+        for reader in self.readers:
+            if reader.ser is not None:
+                self._drop(reader, now, None)
+        self.selector.close()
+
+
+# === RUN: Throughput / Latency against Local pty Stand-ins ===
+def _pty_boards(count, rate, duration):
+    masters, ports, sent = [], {}, {}
+    for i in range(count):
+        master, slave = os.openpty()
+        room = f"room_{i:03d}"
+        ports[room] = os.ttyname(slave)
+        masters.append((room, master, slave))
+        sent[room] = []
+
+    def _board(room, master):
+        period = 1.0 / rate
+        next_t = time.time()
+        end = next_t + duration
+        i = 0
+        while next_t < end:
+            delay = next_t - time.time()
+            if delay > 0:
+                time.sleep(delay)
+            sent[room].append(time.time())
+            os.write(master, f"Outside: {i % 4096} | Inside: {i % 4096}\n".encode())
+            i += 1
+            next_t += period
+
+    threads = [threading.Thread(target=_board, args=(room, master), daemon=True)
+               for room, master, _ in masters]
+    return ports, sent, threads
+
+
+if __name__ == "__main__":
+    import numpy as np
+
+    BOARDS = 32
+    RATE = 200               # lines per second per board
+    DURATION = 5.0
+
+    for use_threads in (False, True):
+        ports, sent, boards = _pty_boards(BOARDS, RATE, DURATION)
+        hub = SerialHub(ports, reset_delay=0.0, use_threads=use_threads)
+        hub.poll(0)              # Open all ports before the boards start
+        for board in boards:
+            board.start()
+
+        received = {room: [] for room in ports}
+        start = time.time()
+        for batch in hub.stream(duration=DURATION + 0.5):
+            for sample in batch:
+                received[sample.room].append(sample.timestamp)
+        elapsed = time.time() - start
+        hub.close()
+
+        # The first line of each port is dropped for resync; align from the end
+        latencies = []
+        for room, stamps in received.items():
+            if stamps:
+                sent_times = sent[room][len(sent[room]) - len(stamps):]
+                latencies.extend(np.array(stamps) - np.array(sent_times))
+        latencies = np.array(latencies) * 1e3
+        total_sent = sum(len(s) for s in sent.values())
+        mode = "threads" if use_threads else "selector"
+        print(f"{BOARDS} ports ({mode}): {hub.samples_read}/{total_sent} samples, "
+              f"{hub.samples_read / elapsed:.0f} samples/s")
+        print(f"Latency: median {np.median(latencies):.2f} ms, "
+              f"p99 {np.percentile(latencies, 99):.2f} ms")